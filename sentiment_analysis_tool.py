@@ -3,14 +3,17 @@
 # Uses Tweepy for Twitter
 
 from __future__ import annotations
-import os, re, io, time, json, zipfile, hashlib, logging
+import os, re, io, time, json, zipfile, hashlib, logging, sqlite3, atexit, threading
+import importlib.metadata
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 from collections import deque, Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
 import numpy as np
 
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 import streamlit as st
 
 import dotenv; dotenv.load_dotenv()
@@ -18,7 +21,8 @@ import dotenv; dotenv.load_dotenv()
 # VADER integration
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 try:
-    from textblob import TextBlob
+    # the pattern scorer behind TextBlob(...).sentiment, called directly to skip per-text blob setup
+    from textblob.en import sentiment as _textblob_sentiment
     _HAS_TEXTBLOB = True
 except Exception:
     _HAS_TEXTBLOB = False
@@ -52,6 +56,8 @@ ETH_FULL2SHORT = {v:k for k,v in ETH_SHORT2FULL.items()}
 
 LABEL_TO_NUM = {"negative":-1, "neutral":0, "positive":1}
 NUM_TO_LABEL = {-1:"negative", 0:"neutral", 1:"positive"}
+SENTIMENT_LABELS = ("negative","neutral","positive")
+LABEL_DTYPE = pd.CategoricalDtype(list(SENTIMENT_LABELS))
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 LOG = logging.getLogger("app")
@@ -65,15 +71,32 @@ def safe_read_csv(path: Path, **kwargs) -> pd.DataFrame:
         LOG.info(f"[safe_read_csv] failed {path}: {e}")
         return pd.DataFrame()
 
+# PII patterns are compiled once and applied in order (handles, then URLs, then emails)
+_PII_PATTERNS = (
+    (re.compile(r"@\w+"), "[REDACTED]"),
+    (re.compile(r"https?://\S+"), "[URL]"),
+    (re.compile(r"\S+@\S+"), "[EMAIL]"),
+)
+
+def _scrub_series(s: pd.Series) -> pd.Series:
+    s = s.astype(str)
+    # only rows that can contain a handle, URL or email need the regex passes
+    hit = s.str.contains("@", regex=False) | s.str.contains("://", regex=False)
+    if not hit.any():
+        return s
+    sub = s[hit]
+    for pat, repl in _PII_PATTERNS:
+        sub = sub.str.replace(pat, repl, regex=True)
+    s = s.copy()
+    s[hit] = sub
+    return s
+
 def _strip_pii(df: pd.DataFrame) -> pd.DataFrame:
     out = df.copy()
     pii_cols = ["author","reply_to_author","reply_to_text","authorLink","username","user","handle","link","channel"]
     out = out.drop(columns=[c for c in pii_cols if c in out.columns], errors="ignore")
     if "text" in out.columns:
-        out["text"] = out["text"].astype(str)
-        out["text"] = out["text"].str.replace(r"@\w+", "[REDACTED]", regex=True)
-        out["text"] = out["text"].str.replace(r"https?://\S+", "[URL]", regex=True)
-        out["text"] = out["text"].str.replace(r"\S+@\S+", "[EMAIL]", regex=True)
+        out["text"] = _scrub_series(out["text"])
     return out
 
 def _short_numeric_id(source_id: str, text: str) -> int:
@@ -90,25 +113,29 @@ def _ensure_id(df: pd.DataFrame) -> pd.DataFrame:
     if "id" not in out.columns:
         out["id"] = pd.Series([pd.NA] * len(out), dtype="Int64")
 
-    def _needs(i):
-        v = out.at[i, "id"]
+    def _needs(v):
         try:
             return pd.isna(v) or int(v) == 0
         except Exception:
             return True
 
-    
-    for i in range(len(out)):
-        if not _needs(i):
-            continue
-        text = str(out.iloc[i].get("text", "") or "")
-        if "comment_id" in out.columns and pd.notna(out.iloc[i].get("comment_id", pd.NA)):
-            src = str(out.iloc[i]["comment_id"])
-        elif "tweet_id" in out.columns and pd.notna(out.iloc[i].get("tweet_id", pd.NA)):
-            src = str(out.iloc[i]["tweet_id"])
-        else:
-            src = str(pd.util.hash_pandas_object(pd.Series([text]), index=False).iloc[0])
-        out.at[i, "id"] = _short_numeric_id(src, text)
+    ids = out["id"].tolist()
+    need = [k for k, v in enumerate(ids) if _needs(v)]
+    if need:
+        # read whole columns once instead of materializing a row per id, and hash all text-only rows in one call
+        texts = [str(t or "") for t in (out["text"].iloc[need].tolist() if "text" in out.columns else [""] * len(need))]
+        srcs: List[Optional[str]] = [None] * len(need)
+        for col in ("comment_id", "tweet_id"):
+            if col in out.columns:
+                srcs = [s if s is not None else (str(v) if pd.notna(v) else None) for s, v in zip(srcs, out[col].iloc[need].tolist())]
+        bare = [j for j, src in enumerate(srcs) if src is None]
+        if bare:
+            hashed = pd.util.hash_pandas_object(pd.Series([texts[j] for j in bare]), index=False)
+            for j, h in zip(bare, hashed.tolist()):
+                srcs[j] = str(h)
+        for k, src, text in zip(need, srcs, texts):
+            ids[k] = _short_numeric_id(src, text)
+        out["id"] = ids
 
     out["id"] = pd.to_numeric(out["id"], errors="coerce").fillna(0).astype(int) % 100000
     return out
@@ -158,23 +185,30 @@ def _default_cft_paths() -> Tuple[str,str]:
 
 def unpack_crx(crx_path: Path, out_dir: Path) -> Path:
     out_dir.mkdir(parents=True, exist_ok=True)
-    b = crx_path.read_bytes()
-    if b[:4] != b"Cr24":
-        try:
-            with zipfile.ZipFile(io.BytesIO(b)) as zf:
-                zf.extractall(out_dir)
-                return out_dir
-        except Exception:
-            pass
-    magic = b"PK\x03\x04"
-    i = b.find(magic)
-    if i == -1:
-        raise RuntimeError("Not a CRX or ZIP")
-    with zipfile.ZipFile(io.BytesIO(b[i:])) as zf:
-        zf.extractall(out_dir)
+    # the unpacked tree is reused across runs while the CRX itself is unchanged
+    crx_stat = crx_path.stat()
+    stamp = out_dir / ".crx_stamp"
+    sig = f"{crx_path.resolve()}|{crx_stat.st_size}|{crx_stat.st_mtime_ns}"
+    try:
+        if (out_dir / "manifest.json").is_file() and stamp.read_text(encoding="utf-8") == sig:
+            return out_dir
+    except OSError:
+        pass
+    try:
+        # zipfile finds the archive from its end record and skips the CRX header, so the file is read in place
+        with zipfile.ZipFile(crx_path) as zf:
+            zf.extractall(out_dir)
+    except zipfile.BadZipFile:
+        b = crx_path.read_bytes()
+        i = b.find(b"PK\x03\x04")
+        if i == -1:
+            raise RuntimeError("Not a CRX or ZIP")
+        with zipfile.ZipFile(io.BytesIO(b[i:])) as zf:
+            zf.extractall(out_dir)
+    stamp.write_text(sig, encoding="utf-8")
     return out_dir
 
-def make_driver(unpacked_ext: Path, chrome_binary: str, chromedriver_path: str, browser_version: str, download_dir: Optional[Path]):
+def make_driver(unpacked_ext: Path, chrome_binary: str, chromedriver_path: str, browser_version: str, download_dir: Optional[Path], cache_dir: Optional[Path] = None):
     from selenium import webdriver
     from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.chrome.service import Service
@@ -187,6 +221,12 @@ def make_driver(unpacked_ext: Path, chrome_binary: str, chromedriver_path: str,
     opts.add_argument("--disable-notifications")
     opts.add_argument("--disable-popup-blocking")
     opts.add_argument("--start-maximized")
+    # return from driver.get at DOMContentLoaded; goto_video waits for the title element itself
+    opts.page_load_strategy = "eager"
+    # the temporary profile is discarded on quit; a kept HTTP cache lets later runs reuse YouTube's static assets
+    if cache_dir:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        opts.add_argument(f"--disk-cache-dir={cache_dir.resolve()}")
 
     if not Path(chrome_binary).exists():
         raise RuntimeError(f"Invalid CHROME_BINARY: {chrome_binary}")
@@ -226,84 +266,89 @@ def make_driver(unpacked_ext: Path, chrome_binary: str, chromedriver_path: str,
             pass
     return driver
 
-def goto_video(driver, url: str, timeout: int = 45):
+_CONSENT_XPATH = " | ".join([
+    "//button[contains(@aria-label, 'I agree')]",
+    "//button[contains(., 'I agree') or contains(., 'Accept all')]",
+    "//span[contains(., 'Reject all')]/ancestor::button",
+])
+
+def goto_video(driver, url: str, timeout: int = 45, handle_consent: bool = True):
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
     driver.get(url)
-    for sel in [
-        (By.CSS_SELECTOR, "button[aria-label*='I agree']"),
-        (By.XPATH, "//button[contains(., 'I agree') or contains(., 'Accept all')]"),
-        (By.XPATH, "//span[contains(., 'Reject all')]/ancestor::button"),
-    ]:
+    # the consent choice sticks to the browser profile, so callers only need this on the first page
+    if handle_consent:
         try:
-            WebDriverWait(driver, 5).until(EC.element_to_be_clickable(sel)).click()
-            break
+            WebDriverWait(driver, 5).until(EC.element_to_be_clickable((By.XPATH, _CONSENT_XPATH))).click()
         except Exception:
             pass
     WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.CSS_SELECTOR, "h1.title, h1 yt-formatted-string")))
 
+# YCS panel scripts/selectors, built once and reused on every poll
+# both button forms in one union, so a wait returns as soon as either is clickable
+_YCS_LOAD_ALL_XPATH = "//button[normalize-space()='Load all'] | //button[.//span[normalize-space()='Load all']]"
+# ready check + save click in one script, so each poll is a single WebDriver round-trip
+_JS_YCS_SAVE_WHEN_READY = r"""
+    try{
+      const app = document.getElementsByClassName('ycs-app')[0];
+      if (!app) return 0;
+      const st = document.getElementById('ycs_status_cmnt');
+      const k = st && st.children && st.children[0] && st.children[0].children
+                && st.children[0].children[0] && st.children[0].children[0].children
+                ? st.children[0].children[0].children.length : 0;
+      if (k < 5) return 0;
+      const btn = document.getElementById('ycs_save_all_comments');
+      if (!btn) return 0;
+      try{ btn.scrollIntoView({block:'center'}); }catch(e){}
+      btn.click();
+      return 1;
+    }catch(e){ return 0; }
+"""
+
+# same probes as before, cheapest first, returning on the first hit; //*[contains(., title)] holds exactly
+# when the root's string-value (its textContent) contains the title, so that is checked once
+_JS_YCS_PANEL_PRESENT = r"""
+    try{
+      if (document.querySelector("[class*='ycs'], [id*='ycs']")) return 1;
+      const norm = (t) => (t || '').replace(/[ \t\r\n]+/g, ' ').replace(/^ | $/g, '');
+      for (const b of document.getElementsByTagName('button')){
+        const t = norm(b.textContent);
+        if (t === 'Load all' || t === 'save' || t === 'open') return 1;
+        for (const sp of b.getElementsByTagName('span')) if (norm(sp.textContent) === 'Load all') return 1;
+      }
+      const root = document.documentElement;
+      return root && (root.textContent || '').includes('YouTube Comment Search') ? 1 : 0;
+    }catch(e){ return 0; }
+"""
+
 def wait_for_ycs_panel(driver, poll_s: float = 0.5):
-    from selenium.webdriver.common.by import By
-    probes = [
-        (By.XPATH, "//*[contains(., 'YouTube Comment Search')]"),
-        (By.XPATH, "//button[normalize-space()='Load all']"),
-        (By.XPATH, "//button[.//span[normalize-space()='Load all']]"),
-        (By.XPATH, "//button[normalize-space()='save']"),
-        (By.XPATH, "//button[normalize-space()='open']"),
-        (By.CSS_SELECTOR, "[class*='ycs'], [id*='ycs']"),
-    ]
+    # one early-exit script per poll: a single WebDriver round-trip
     while True:
-        for how, what in probes:
-            try:
-                if driver.find_elements(how, what):
-                    time.sleep(0.8)
-                    return
-            except Exception:
-                pass
+        try:
+            if driver.execute_script(_JS_YCS_PANEL_PRESENT) == 1:
+                time.sleep(0.8)
+                return
+        except Exception:
+            pass
         time.sleep(poll_s)
 
 def ycs_click_load_all(driver):
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
-    for xp in ["//button[normalize-space()='Load all']", "//button[.//span[normalize-space()='Load all']]"]:
-        try:
-            WebDriverWait(driver, 6).until(EC.element_to_be_clickable((By.XPATH, xp))).click()
-            break
-        except Exception:
-            pass
+    # one wait over both forms with the old combined budget, instead of 6s per form in turn
+    try:
+        WebDriverWait(driver, 12).until(EC.element_to_be_clickable((By.XPATH, _YCS_LOAD_ALL_XPATH))).click()
+    except Exception:
+        pass
 
 def ycs_wait_and_click_save(driver, max_wait_s: int = 0):
     import time
     start = time.time()
-    def _ready() -> bool:
-        return bool(driver.execute_script(r"""
-            try{
-              const app = document.getElementsByClassName('ycs-app')[0];
-              if (!app) return 0;
-              const st = document.getElementById('ycs_status_cmnt');
-              const k = st && st.children && st.children[0] && st.children[0].children
-                        && st.children[0].children[0] && st.children[0].children[0].children
-                        ? st.children[0].children[0].children.length : 0;
-              return k >= 5 ? 1 : 0;
-            }catch(e){ return 0; }
-        """))
-    def _click_save() -> bool:
-        return driver.execute_script(r"""
-            try{
-              const btn = document.getElementById('ycs_save_all_comments');
-              if (!btn) return 0;
-              try{ btn.scrollIntoView({block:'center'}); }catch(e){}
-              btn.click();
-              return 1;
-            }catch(e){ return 0; }
-        """) == 1
     while True:
-        if _ready():
-            if _click_save():
-                time.sleep(0.6)
-                return
+        if driver.execute_script(_JS_YCS_SAVE_WHEN_READY) == 1:
+            return
         if max_wait_s and (time.time() - start) > max_wait_s:
             raise RuntimeError("YCS save not clicked before timeout")
         time.sleep(0.12)
@@ -315,16 +360,51 @@ def _prepare_download_dir(d: Path) -> Path:
         except Exception: pass
     return d
 
-def wait_for_download(download_dir: Path, start_ts: float) -> Path:
+def wait_for_download(download_dir: Path, start_ts: float, start_timeout_s: float = 0.0, poll_s: float = 0.25) -> Path:
+    """
+    Wait for a download started after start_ts to finish and return its path.
+    With start_timeout_s, raise if no download has appeared by then.
+    """
+    started = False
     while True:
-        files = [p for p in download_dir.glob("*") if p.is_file()]
-        partials = [p for p in files if p.suffix == ".crdownload" and p.stat().st_mtime >= start_ts - 0.5]
-        done = [p for p in files if p.suffix != ".crdownload" and p.stat().st_mtime >= start_ts - 0.5]
-        if done and not partials:
-            return max(done, key=lambda p: p.stat().st_mtime)
-        time.sleep(0.3)
+        partial = False; done = []
+        # one directory scan per tick covers both "has it started" and "has it finished"
+        with os.scandir(download_dir) as it:
+            for e in it:
+                if not e.is_file(): continue
+                is_partial = e.name.endswith(".crdownload")
+                started = started or is_partial
+                mtime = e.stat().st_mtime
+                if mtime < start_ts - 0.5: continue
+                if is_partial: partial = True
+                else: done.append((mtime, e.path))
+        if done:
+            started = True
+            if not partial:
+                return Path(max(done)[1])
+        if start_timeout_s and not started and time.time() - start_ts > start_timeout_s:
+            raise RuntimeError("YCS save did not start")
+        time.sleep(poll_s)
 
 _YT_LINK = re.compile(r'(https?://(?:www\.)?youtube\.com/\S+|https?://youtu\.be/\S+)', re.I)
+_WS_RUN = re.compile(r'[ \t]+')
+_REPLIES_LINE = re.compile(r'(?m)^\s*Replies:\s*$')
+_BLANK_RUN = re.compile(r'\n{3,}')
+_META_LIKES = re.compile(r'like:\s*([0-9,]+)', re.I)
+_META_REPLIES = re.compile(r'repl(?:y|ies):\s*([0-9,]+)', re.I)
+_DASH_LINE = re.compile(r'^\s*-\s*$')
+
+# YCS "save" dump (parse_ycs_save_txt)
+_YCS_LC = re.compile(r'[?&#]lc=([A-Za-z0-9_.\-]+)')
+_YCS_COUNT_LINE = re.compile(r'\b(?:like|reply):\s*\d', re.I)
+_YCS_MARKERS = frozenset(("[COMMENT]", "[REPLY]", "Replies:"))
+_YCS_AGO_LINE = re.compile(r'^\d+.*ago\b', re.I)
+_YCS_LEAD_HANDLE = re.compile(r'^\s*@\S+\s*\n')
+_YCS_USER = re.compile(r'@([^\n]+)')
+_YCS_CHANNEL = re.compile(r'(?:https?://)?youtube\.com/@[^\n]+')
+_YCS_WATCH = re.compile(r'(?:https?://)?youtube\.com/watch[^\n]+')
+_YCS_TIME = re.compile(r'(\d[^\n]*?ago|edited\))', re.I)
+_YCS_LIKES = re.compile(r'like:\s*(\d+)', re.I)
 
 def _skip_blanks(lines, i):
     n=len(lines)
@@ -338,21 +418,21 @@ def _read_until_blank(lines, i):
     return "\n".join(res), i
 
 def _clean_text(s: str) -> str:
-    s = re.sub(r'[ \t]+', ' ', s).strip()
-    s = re.sub(r'(?m)^\s*Replies:\s*$', '', s)
-    return re.sub(r'\n{3,}', '\n\n', s).strip()
+    s = _WS_RUN.sub(' ', s).strip()
+    s = _REPLIES_LINE.sub('', s)
+    return _BLANK_RUN.sub('\n\n', s).strip()
 
 def _parse_meta(s: str):
     posted = s.split("|",1)[0].strip()
     likes=0; replies=0
-    m1=re.search(r'like:\s*([0-9,]+)',s,re.I)
-    m2=re.search(r'repl(?:y|ies):\s*([0-9,]+)',s,re.I)
+    m1=_META_LIKES.search(s)
+    m2=_META_REPLIES.search(s)
     if m1: likes=int(m1.group(1).replace(",",""))
     if m2: replies=int(m2.group(1).replace(",",""))
     return posted,likes,replies
 
 def _parse_reply_block(lines, i):
-    n=len(lines); assert re.match(r'^\s*-\s*$', lines[i]); i+=1
+    n=len(lines); assert _DASH_LINE.match(lines[i]); i+=1
     i=_skip_blanks(lines,i)
     author=""
     if i<n and lines[i].lstrip().startswith("@"):
@@ -360,7 +440,7 @@ def _parse_reply_block(lines, i):
         if i<n and lines[i].strip().startswith("youtube.com/@"): i+=1
     i=_skip_blanks(lines,i)
     link=""
-    if i<n and _YT_LINK.search(lines[i]): link=_YT_LINK.search(lines[i]).group(0); i+=1
+    if i<n and (m := _YT_LINK.search(lines[i])): link=m.group(0); i+=1
     i=_skip_blanks(lines,i)
     posted=""; likes=0
     if i<n and "like:" in lines[i].lower(): posted,likes,_=_parse_meta(lines[i]); i+=1
@@ -375,7 +455,7 @@ def _parse_comment_block(lines, i):
     if i<n and lines[i].strip().startswith("youtube.com/@"): i+=1
     i=_skip_blanks(lines,i)
     link=""
-    if i<n and _YT_LINK.search(lines[i]): link=_YT_LINK.search(lines[i]).group(0); i+=1
+    if i<n and (m := _YT_LINK.search(lines[i])): link=m.group(0); i+=1
     i=_skip_blanks(lines,i)
     posted=""; likes=0; replies=0
     if i<n and "like:" in lines[i].lower():
@@ -384,7 +464,7 @@ def _parse_comment_block(lines, i):
     body,i=_read_until_blank(lines,i); body=_clean_text(body)
     repl=[]
     i=_skip_blanks(lines,i)
-    while i<n and re.match(r'^\s*-\s*$', lines[i]):
+    while i<n and _DASH_LINE.match(lines[i]):
         r,i=_parse_reply_block(lines,i); repl.append(r)
         i=_skip_blanks(lines,i)
     return dict(author=author,text=body,likes=likes,link=link,replies=repl,time=posted), i
@@ -403,57 +483,78 @@ def _parse_plain(s: str) -> List[dict]:
     return out
 
 def parse_ycs_save_txt(s: str) -> List[dict]:
-    import re
     def _uurl(u: str) -> str:
         u = (u or "").strip()
         if not u: return ""
         return u if u.startswith("http") else "https://" + u
     def _cid(url: str) -> str:
-        m = re.search(r'[?&#]lc=([A-Za-z0-9_.\-]+)', url or "")
+        m = _YCS_LC.search(url or "")
         return m.group(1) if m else ""
-    def _body(block: str) -> str:
-        lines = block.splitlines()
+    def _body(lines: List[str]) -> str:
         keep = []
         for ln in lines:
             t = ln.strip()
-            if not t:
-                keep.append(ln); continue
-            if t in ("[COMMENT]","[REPLY]","Replies:"): continue
-            if t.startswith("youtube.com/@"): continue
-            if "youtube.com/watch" in t: continue
-            if re.search(r'\blike:\s*\d+', t, flags=re.I): continue
-            if re.search(r'\breply:\s*\d+', t, flags=re.I): continue
-            if re.search(r'^\d+.*ago\b', t, flags=re.I) or "edited)" in t: continue
-            if t.startswith("YCS -") or t.startswith("Comments File created"): continue
+            # cheap substring/first-char tests gate each regex, so plain body lines skip them all
+            if t:
+                if t in _YCS_MARKERS: continue
+                if "youtube.com/" in t and (t.startswith("youtube.com/@") or "youtube.com/watch" in t): continue
+                if ":" in t and _YCS_COUNT_LINE.search(t): continue
+                if (t[0].isdigit() and _YCS_AGO_LINE.search(t)) or "edited)" in t: continue
+                if t.startswith(("YCS -", "Comments File created")): continue
             keep.append(ln)
         out = "\n".join(keep).strip()
-        out = re.sub(r'^\s*@\S+\s*\n', '', out).strip()
+        out = _YCS_LEAD_HANDLE.sub('', out).strip()
         return out
-    def _parse_block(block: str) -> dict:
-        user_m = re.search(r'@([^\n]+)', block)
+    def _parse_block(lines: List[str]) -> dict:
+        block = "\n".join(lines)
+        user_m = _YCS_USER.search(block)
         user = f"@{user_m.group(1).strip()}" if user_m else ""
-        ch_m = re.search(r'(?:https?://)?youtube\.com/@[^\n]+', block)
+        ch_m = _YCS_CHANNEL.search(block)
         channel = _uurl(ch_m.group(0)) if ch_m else ""
-        url_m = re.search(r'(?:https?://)?youtube\.com/watch[^\n]+', block)
+        url_m = _YCS_WATCH.search(block)
         url = _uurl(url_m.group(0)) if url_m else ""
-        time_m = re.search(r'(\d[^\n]*?ago|edited\))', block, flags=re.I)
+        time_m = _YCS_TIME.search(block)
         time_s = time_m.group(1).strip() if time_m else ""
-        likes_m = re.search(r'like:\s*(\d+)', block, flags=re.I)
+        likes_m = _YCS_LIKES.search(block)
         likes = int(likes_m.group(1)) if likes_m else 0
-        text = _body(block)
+        text = _body(lines)
         return {"author": user,"authorLink":channel,"link":url,"time":time_s,"likes":likes,"id":_cid(url),"text":text}
-    s = s.replace("\r\n", "\n").replace("\r", "\n").replace('\\"', '"').strip()
-    sections = [sec.strip() for sec in re.split(r'(?m)^\s*#{3,}\s*$', s) if sec.strip()]
+    def _sections(lines: List[str]):
+        # one pass over the dump: a line of 3+ '#' closes the section in flight
+        buf: List[str] = []
+        for ln in lines:
+            t = ln.strip()
+            if len(t) >= 3 and not t.strip("#"):
+                yield buf; buf = []
+            else:
+                buf.append(ln)
+        yield buf
+    def _trim(sec: List[str]) -> List[str]:
+        i, j = 0, len(sec)
+        while i < j and not sec[i].strip(): i += 1
+        while j > i and not sec[j-1].strip(): j -= 1
+        sec = sec[i:j]
+        if sec: sec[0] = sec[0].lstrip(); sec[-1] = sec[-1].rstrip()
+        return sec
+    def _parts(sec: List[str]) -> List[List[str]]:
+        # a bare [REPLY] line between two other lines starts the next reply
+        parts: List[List[str]] = [[]]
+        last = len(sec) - 1; after_sep = False
+        for j, ln in enumerate(sec):
+            if ln == "[REPLY]" and 0 < j < last and not after_sep:
+                parts.append([]); after_sep = True
+            else:
+                parts[-1].append(ln); after_sep = False
+        return parts
+    s = s.replace('\\"', '"')
     out: List[dict] = []
-    for sec in sections:
-        if not sec.startswith("[COMMENT]"):
+    for sec in _sections(s.splitlines()):
+        sec = _trim(sec)
+        if not sec or not sec[0].startswith("[COMMENT]"):
             continue
-        parts = re.split(r'\n\[REPLY\]\n', sec)
-        head = parts[0]
-        comment = _parse_block(head)
-        comment["replies"] = []
-        for rep in parts[1:]:
-            comment["replies"].append(_parse_block(rep))
+        parts = _parts(sec)
+        comment = _parse_block(parts[0])
+        comment["replies"] = [_parse_block(rep) for rep in parts[1:]]
         out.append(comment)
     return out
 
@@ -498,29 +599,37 @@ def parse_ycs_export(raw: str) -> pd.DataFrame:
     df["text"] = df["text"].fillna("").astype(str)
     return _strip_pii(df)
 
-def run_youtube(urls: List[str], crx_path: Path, chrome_binary: str, chromedriver: str, cft_version: str, outdir: Path) -> pd.DataFrame:
-    ext_dir = unpack_crx(crx_path, outdir / "ycs_unpacked")
-    dl_dir = _prepare_download_dir(outdir / "ycs_downloads")
-    driver = make_driver(ext_dir, chrome_binary, chromedriver, cft_version, dl_dir)
+YCS_WORKERS = max(1, int(os.environ.get("YCS_WORKERS", "1")))
+# seconds for a save to start: the old 25 start polls at 0.25s plus the 0.6s pause after the click
+YCS_SAVE_START_TIMEOUT_S = 25 * 0.25 + 0.6
+_YT_VIDEO_ID = re.compile(r'(?:[?&]v=|youtu\.be/|/(?:shorts|embed|live)/)([\w-]{11})')
+
+def _unique_video_urls(urls: List[str]) -> List[str]:
+    """
+    Drop blank lines and repeat videos (same id under a different URL form), keeping first-seen order
+    """
+    keyed = {}
+    for u in (u.strip() for u in urls):
+        if u:
+            m = _YT_VIDEO_ID.search(u)
+            keyed.setdefault(m.group(1) if m else u, u)
+    return list(keyed.values())
+
+def _ycs_scrape_urls(urls: List[str], ext_dir: Path, chrome_binary: str, chromedriver: str, cft_version: str, dl_dir: Path, cache_dir: Optional[Path] = None) -> List[pd.DataFrame]:
+    """
+    Scrape a list of videos on one driver with its own download folder; returns one frame per video
+    """
+    driver = make_driver(ext_dir, chrome_binary, chromedriver, cft_version, dl_dir, cache_dir)
     all_rows=[]
     try:
-        for u in urls:
-            goto_video(driver, u)
+        for k, u in enumerate(urls):
+            goto_video(driver, u, handle_consent=(k == 0))
             wait_for_ycs_panel(driver)
             ycs_click_load_all(driver)
             ycs_wait_and_click_save(driver, max_wait_s=0)
             t0 = time.time()
-            # wait for the text file download to start
-            started = False
-            for _ in range(25):
-                if any(p.suffix == ".crdownload" for p in dl_dir.glob("*")):
-                    started = True; break
-                if any(p.is_file() and p.suffix != ".crdownload" and p.stat().st_mtime >= t0 - 0.5 for p in dl_dir.glob("*")):
-                    started = True; break
-                time.sleep(0.25)
-            if not started:
-                raise RuntimeError("YCS save did not start")
-            fpath = wait_for_download(dl_dir, start_ts=t0)
+            # the download poll replaces the fixed pause after the click
+            fpath = wait_for_download(dl_dir, start_ts=t0, start_timeout_s=YCS_SAVE_START_TIMEOUT_S)
             raw = _read_text_auto(fpath)
             try: fpath.unlink()
             except Exception: pass
@@ -533,6 +642,26 @@ def run_youtube(urls: List[str], crx_path: Path, chrome_binary: str, chromedrive
     finally:
         try: driver.quit()
         except Exception: pass
+    return all_rows
+
+def run_youtube(urls: List[str], crx_path: Path, chrome_binary: str, chromedriver: str, cft_version: str, outdir: Path, workers: int = YCS_WORKERS) -> pd.DataFrame:
+    urls = _unique_video_urls(urls)
+    ext_dir = unpack_crx(crx_path, outdir / "ycs_unpacked")
+    dl_root = outdir / "ycs_downloads"
+    cache_root = outdir / "chrome_cache"  # one per worker slot; Chrome instances should not share a cache dir
+    workers = max(1, min(int(workers), len(urls)))
+    if workers == 1:
+        all_rows = _ycs_scrape_urls(urls, ext_dir, chrome_binary, chromedriver, cft_version, _prepare_download_dir(dl_root), cache_root / "w0")
+    else:
+        # each worker drives its own browser (a separate Chrome process, so threads are enough) over a
+        # contiguous slice of the URLs with a private download folder; slices are joined back in input order
+        size = -(-len(urls) // workers)
+        shards = [urls[i:i+size] for i in range(0, len(urls), size)]
+        with ThreadPoolExecutor(max_workers=len(shards)) as pool:
+            parts = list(pool.map(
+                lambda k: _ycs_scrape_urls(shards[k], ext_dir, chrome_binary, chromedriver, cft_version, _prepare_download_dir(dl_root / f"w{k}"), cache_root / f"w{k}"),
+                range(len(shards))))
+        all_rows = [df for part in parts for df in part]
     if not all_rows:
         return pd.DataFrame()
     out = pd.concat(all_rows, ignore_index=True)
@@ -623,23 +752,132 @@ def fetch_tweets_official(query: str, limit: int, scope: str, start_date: Option
 
 # Scoring data
 
-def label_from_vader(x: float) -> str:
-    return "positive" if x >= 0.05 else ("negative" if x <= -0.05 else "neutral")  # per VADER validation thresholds :contentReference[oaicite:11]{index=11}
+def _vader_labels(scores: pd.Series) -> pd.Series:
+    """
+    Label a whole VADER compound column per the VADER validation thresholds, returned as LABEL_DTYPE:
+    positive if >= 0.05, negative if <= -0.05, otherwise neutral
+    """
+    x = pd.to_numeric(scores, errors="coerce").to_numpy(dtype=float)
+    # codes follow SENTIMENT_LABELS order; NaN fails both tests and lands on neutral
+    codes = np.select([x >= 0.05, x <= -0.05], [2, 0], default=1).astype(np.int8)
+    return pd.Series(pd.Categorical.from_codes(codes, dtype=LABEL_DTYPE), index=scores.index)
+
+def _as_label_cat(s: pd.Series) -> pd.Series:
+    """
+    Store a normalized sentiment label column as LABEL_DTYPE (int8 codes); columns holding other values are left as-is
+    """
+    if s.dtype == LABEL_DTYPE:
+        return s
+    if not s.dropna().isin(SENTIMENT_LABELS).all():
+        return s
+    return s.astype(LABEL_DTYPE)
+
+@st.cache_resource(show_spinner=False)
+def _vader_analyzer() -> SentimentIntensityAnalyzer:
+    # lexicon/emoji tables are loaded once per server process, not on every scoring run
+    return SentimentIntensityAnalyzer()
+
+# Persistent text -> (vader, textblob) cache so re-runs only score comments not seen before
+SCORE_CACHE_PATH = APP_OUTDIR / ".score_cache.sqlite"
+
+def _pkg_version(name: str) -> str:
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return ""
+
+# analyzer versions the cached scores came from; a different signature empties the cache on first use
+_SCORE_CACHE_SIG = f"vader={_pkg_version('vaderSentiment')};textblob={_pkg_version('textblob') if _HAS_TEXTBLOB else ''}"
+
+def _score_cache_key(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8", "ignore"), digest_size=16).hexdigest()
+
+def _score_cache_conn() -> sqlite3.Connection:
+    con = sqlite3.connect(SCORE_CACHE_PATH)
+    con.execute("CREATE TABLE IF NOT EXISTS score_cache (k TEXT PRIMARY KEY, vader REAL, textblob REAL)")
+    con.execute("CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v TEXT)")
+    row = con.execute("SELECT v FROM meta WHERE k = 'scorer'").fetchone()
+    if row is None or row[0] != _SCORE_CACHE_SIG:
+        with con:
+            con.execute("DELETE FROM score_cache")
+            con.execute("INSERT OR REPLACE INTO meta VALUES ('scorer', ?)", (_SCORE_CACHE_SIG,))
+    return con
+
+def _score_cache_get(keys: List[str]) -> Dict[str, Tuple[float, Optional[float]]]:
+    found: Dict[str, Tuple[float, Optional[float]]] = {}
+    if not keys:
+        return found
+    try:
+        con = _score_cache_conn()
+    except sqlite3.Error:
+        return found
+    try:
+        # rows scored while TextBlob was missing are misses once it is installed
+        cond = " AND textblob IS NOT NULL" if _HAS_TEXTBLOB else ""
+        uniq = list(dict.fromkeys(keys))
+        for i in range(0, len(uniq), 500):
+            part = uniq[i:i+500]
+            q = f"SELECT k, vader, textblob FROM score_cache WHERE k IN ({','.join('?'*len(part))}){cond}"
+            for k, v, tb in con.execute(q, part):
+                found[k] = (v, tb)
+    except sqlite3.Error:
+        pass
+    finally:
+        con.close()
+    return found
+
+def _score_cache_put(items: List[Tuple[str, Tuple[float, Optional[float]]]]) -> None:
+    if not items:
+        return
+    try:
+        con = _score_cache_conn()
+    except sqlite3.Error:
+        return
+    try:
+        with con:
+            con.executemany("INSERT OR REPLACE INTO score_cache VALUES (?,?,?)", [(k, v, tb) for k, (v, tb) in items])
+    except sqlite3.Error:
+        pass
+    finally:
+        con.close()
+
+def _score_batch(texts: List[str]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    VADER compound and, when installed, TextBlob polarity for every text in a single pass
+    """
+    vader = _vader_analyzer().polarity_scores
+    polarity = _textblob_sentiment if _HAS_TEXTBLOB else None
+    texts = [t or "" for t in texts]
+    keys = [_score_cache_key(t) for t in texts]
+    known = _score_cache_get(keys)
+    fresh: List[Tuple[str, Tuple[float, Optional[float]]]] = []
+    v = np.empty(len(texts), dtype=float)
+    tb = np.empty(len(texts), dtype=float) if _HAS_TEXTBLOB else None
+    for i, (k, t) in enumerate(zip(keys, texts)):
+        sc = known.get(k)
+        if sc is None:
+            sc = known[k] = (vader(t)["compound"], polarity(t)[0] if polarity else None)
+            fresh.append((k, sc))
+        v[i] = sc[0]
+        if tb is not None:
+            tb[i] = sc[1]
+    _score_cache_put(fresh)
+    return v, tb
 
 def score_sentiment(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return df
     out = _rekey_parent_id_to_id(_ensure_id(df))
-    sia = SentimentIntensityAnalyzer()
-    out["vader"] = out["text"].apply(lambda t: sia.polarity_scores(t or "")["compound"])
-    if _HAS_TEXTBLOB:
-        out["textblob"] = out["text"].apply(lambda t: TextBlob(t or "").sentiment.polarity)
+    vader, textblob = _score_batch(out["text"].tolist())
+    out["vader"] = vader
+    if textblob is not None:
+        out["textblob"] = textblob
         out["score"] = (out["vader"] + out["textblob"]) / 2.0
     else:
         out["textblob"] = None
         out["score"] = out["vader"]
-    out["vader_label"] = out["vader"].apply(label_from_vader)
-    out["label_num"] = out["vader_label"].map(LABEL_TO_NUM)
+    out["vader_label"] = _vader_labels(out["vader"])
+    out["label_num"] = out["vader_label"].map(LABEL_TO_NUM).astype(int)
     return out
 
 # OpenRouter API
@@ -648,21 +886,85 @@ _API_CALLS_MADE = 0
 _API_CACHE_HITS = 0
 _DEBUG_BUFFER: List[str] = []
 _LLM_RATELIMIT_TIMES = deque()
+_LLM_RATELIMIT_LOCK = threading.Lock()
+_API_COUNT_LOCK = threading.Lock()
+LLM_CONCURRENCY = max(1, int(os.environ.get("LLM_CONCURRENCY", "4")))
 
 def _debug(msg: str):
     pass
 
+# Persistent (model, text) -> label cache so re-runs only call the API for new rows
+LLM_CACHE_PATH = APP_OUTDIR / ".llm_cache.sqlite"
+LLM_CACHE_TTL_S = 30 * 24 * 3600
+
+def _llm_cache_key(model: str, text: str) -> str:
+    return hashlib.blake2b(f"{model}\0{text}".encode("utf-8", "ignore"), digest_size=16).hexdigest()
+
+def _llm_cache_conn() -> sqlite3.Connection:
+    con = sqlite3.connect(LLM_CACHE_PATH)
+    con.execute(
+        "CREATE TABLE IF NOT EXISTS llm_cache ("
+        "k TEXT PRIMARY KEY, llm_label TEXT, llm_score REAL, llm_sarcasm INTEGER, llm_ethics TEXT, ts REAL)"
+    )
+    return con
+
+def _llm_cache_get(keys: List[str]) -> Dict[str, Dict[str, Any]]:
+    found: Dict[str, Dict[str, Any]] = {}
+    if not keys:
+        return found
+    try:
+        con = _llm_cache_conn()
+    except sqlite3.Error as e:
+        _debug(f"[cache] open failed: {e}")
+        return found
+    try:
+        min_ts = time.time() - LLM_CACHE_TTL_S
+        uniq = list(dict.fromkeys(keys))
+        for i in range(0, len(uniq), 500):
+            part = uniq[i:i+500]
+            q = ("SELECT k, llm_label, llm_score, llm_sarcasm, llm_ethics FROM llm_cache "
+                 f"WHERE ts >= ? AND k IN ({','.join('?'*len(part))})")
+            for k, lab, score, sarc, eth in con.execute(q, [min_ts, *part]):
+                found[k] = {"llm_label": lab, "llm_score": float(score), "llm_sarcasm": bool(sarc), "llm_ethics": eth}
+    except sqlite3.Error as e:
+        _debug(f"[cache] read failed: {e}")
+    finally:
+        con.close()
+    return found
+
+def _llm_cache_put(items: List[Tuple[str, Dict[str, Any]]]) -> None:
+    if not items:
+        return
+    now = time.time()
+    try:
+        con = _llm_cache_conn()
+    except sqlite3.Error as e:
+        _debug(f"[cache] open failed: {e}")
+        return
+    try:
+        with con:
+            con.executemany(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?,?,?,?,?,?)",
+                [(k, r["llm_label"], float(r["llm_score"]), int(bool(r["llm_sarcasm"])), r["llm_ethics"], now) for k, r in items],
+            )
+    except sqlite3.Error as e:
+        _debug(f"[cache] write failed: {e}")
+    finally:
+        con.close()
+
 def _llm_rate_limit_wait(rpm: int):
     rpm = max(1, int(rpm))
     window = 60.0
-    now = time.monotonic()
-    while _LLM_RATELIMIT_TIMES and now - _LLM_RATELIMIT_TIMES[0] > window:
-        _LLM_RATELIMIT_TIMES.popleft()
-    if len(_LLM_RATELIMIT_TIMES) >= rpm:
-        sleep_s = window - (now - _LLM_RATELIMIT_TIMES[0]) + 0.05
-        _debug(f"[rate-limit] sleeping {sleep_s:.2f}s")
-        time.sleep(max(0.0, sleep_s))
-    _LLM_RATELIMIT_TIMES.append(time.monotonic())
+    # requests run on worker threads; the lock keeps the sliding window consistent
+    with _LLM_RATELIMIT_LOCK:
+        now = time.monotonic()
+        while _LLM_RATELIMIT_TIMES and now - _LLM_RATELIMIT_TIMES[0] > window:
+            _LLM_RATELIMIT_TIMES.popleft()
+        if len(_LLM_RATELIMIT_TIMES) >= rpm:
+            sleep_s = window - (now - _LLM_RATELIMIT_TIMES[0]) + 0.05
+            _debug(f"[rate-limit] sleeping {sleep_s:.2f}s")
+            time.sleep(max(0.0, sleep_s))
+        _LLM_RATELIMIT_TIMES.append(time.monotonic())
 
 def _retry_wait_from_headers(h: Dict[str,str]) -> float:
     ra = h.get("Retry-After")
@@ -679,6 +981,15 @@ def _retry_wait_from_headers(h: Dict[str,str]) -> float:
             pass
     return 3.0
 
+@st.cache_resource(show_spinner=False)
+def _http_session() -> requests.Session:
+    # one keep-alive connection pool per server process instead of a TCP+TLS handshake per request
+    s = requests.Session()
+    # sized for every selected model running LLM_CONCURRENCY requests at once
+    s.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=max(8, LLM_CONCURRENCY * len(FREE_MODELS))))
+    atexit.register(s.close)
+    return s
+
 def _openrouter_request(model: str, messages: List[Dict[str,str]], api_key: str, temperature: float, max_tokens: int) -> str:
     global _API_CALLS_MADE
     url = os.environ.get("OPENROUTER_URL", "https://openrouter.ai/api/v1/chat/completions")
@@ -694,8 +1005,9 @@ def _openrouter_request(model: str, messages: List[Dict[str,str]], api_key: str,
     base_timeout = 35
     for attempt in range(1, max_attempts+1):
         try:
-            r = requests.post(url, headers=headers, json=payload, timeout=base_timeout)
-            _API_CALLS_MADE += 1
+            r = _http_session().post(url, headers=headers, json=payload, timeout=base_timeout)
+            with _API_COUNT_LOCK:
+                _API_CALLS_MADE += 1
             _debug(f"[openrouter] status={r.status_code} len={len(r.text)} attempt={attempt}")
             _debug(f"[openrouter] headers: { {k:v for k,v in list(r.headers.items())[:8]} }")
         except requests.RequestException as e:
@@ -799,6 +1111,7 @@ def run_llm_batch(
     toks_per_row: int,
     outdir: str,
     progress_cb: Callable[[Dict[str, Any]], None] | None = None,
+    cancel: threading.Event | None = None,
 ) -> pd.DataFrame:
     """
     Batch LLM labeling and integration 
@@ -946,13 +1259,33 @@ def run_llm_batch(
             }
         return out
 
+    global _API_CACHE_HITS
     planned_calls = 0
     df_out = prior.copy()
+
+    # serve rows already labeled by this model (same text) from the persistent cache
+    todo_keys = [_llm_cache_key(model, t) for t in todo["text"]]
+    hits = _llm_cache_get(todo_keys)
+    if hits:
+        hit_mask = [k in hits for k in todo_keys]
+        cached = pd.DataFrame([{"id": int(r.id), **hits[k], "cache_sig": str(r.cache_sig)}
+                               for r, k, h in zip(todo.itertuples(index=False), todo_keys, hit_mask) if h])
+        with _API_COUNT_LOCK:
+            _API_CACHE_HITS += len(cached)
+        df_out = pd.concat([df_out, cached], ignore_index=True) if not df_out.empty else cached
+        todo = todo.loc[[not h for h in hit_mask]]
+        _write_csv(out_path, df_out[["id","llm_label","llm_score","llm_sarcasm","llm_ethics","cache_sig"]])
+        _debug(f"[cache] {len(cached)} rows served from {LLM_CACHE_PATH.name}")
+
     if todo.empty:
         _debug("[cache] nothing to do; returning prior")
         df_out["model"] = model
         return df_out[["id","llm_label","llm_score","llm_sarcasm","llm_ethics","cache_sig","model"]]
 
+    # identical texts in this run are sent once; the repeats copy that row's answer after the calls
+    dup = todo["text"].duplicated()
+    repeats, todo = todo.loc[dup], todo.loc[~dup]
+
     chunks = _build_chunks(todo)
     planned_calls = len(chunks)
     _emit(0, planned_calls)
@@ -964,41 +1297,85 @@ def run_llm_batch(
         reply = _openrouter_request(model, messages, api_key, 0.0, max_tokens)
         return _parse_block(reply)
 
-    for idx, (ids, user_msg) in enumerate(chunks, start=1):
-        parsed = _request(ids, user_msg)
-        missing = [rid for rid in ids if rid not in parsed]
-        if missing:
-            frame = todo.set_index("id").loc[missing]
-            sub_chunks = _build_chunks(frame.reset_index()[["id","text","cache_sig"]])
-            passes = 0
-            for _ids, _user in sub_chunks:
-                if not missing: break
-                passes += 1
-                got = _request(_ids, _user)
-                parsed.update(got)
-                missing = [rid for rid in ids if rid not in parsed]
-                if passes >= 2 and missing:
-                    break
-
-        # update any missing ids
-        for rid in ids:
-            if rid not in parsed:
-                parsed[rid] = {"id": rid, "llm_label": "neutral", "llm_score": 0.0, "llm_sarcasm": False, "llm_ethics": "none"}
-
-        rows = [parsed[rid] for rid in ids]
-        chunk_df = pd.DataFrame(rows)
-        sig_map = {int(r.id): str(r.cache_sig) for r in todo.itertuples(index=False)}
-        chunk_df["cache_sig"] = chunk_df["id"].map(sig_map).astype(str)
-        chunk_df["model"] = model
-
-        if not df_out.empty:
-            pre = set(zip(df_out["id"].astype(int), df_out["cache_sig"].astype(str)))
-            new_rows = [r for r in chunk_df.itertuples(index=False) if (int(r.id), str(r.cache_sig)) not in pre]
-            chunk_df = pd.DataFrame(new_rows, columns=chunk_df.columns)
-
-        df_out = pd.concat([df_out, chunk_df], ignore_index=True)
-        _write_csv(out_path, df_out[["id","llm_label","llm_score","llm_sarcasm","llm_ethics","cache_sig"]])
-        _emit(idx, planned_calls)
+    text_map = dict(zip(todo["id"].astype(int), todo["text"]))
+    sig_map = dict(zip(todo["id"].astype(int), todo["cache_sig"].astype(str)))
+    out_cols = ["id","llm_label","llm_score","llm_sarcasm","llm_ethics","cache_sig"]
+    # chunk frames are collected and concatenated once; each checkpoint appends only its own rows
+    # to the CSV, which is rewritten sorted at the end
+    pre = set(zip(df_out["id"].astype(int), df_out["cache_sig"].astype(str)))
+    parts = [df_out]
+    _write_csv(out_path, df_out[out_cols])
+    def _in_order(pool: ThreadPoolExecutor, width: int):
+        # submit the next chunk only as a reply is consumed, so at most `width` requests are outstanding
+        # and an exception in the consumer (e.g. a Streamlit stop from progress_cb) leaves nothing queued
+        inflight = deque()
+        for c in chunks:
+            # once cancelled, no new chunks go out; replies already requested are still checkpointed
+            if cancel is not None and cancel.is_set():
+                break
+            inflight.append((c, pool.submit(_request, *c)))
+            if len(inflight) >= width:
+                c0, fut = inflight.popleft()
+                yield c0, fut.result()
+        while inflight:
+            c0, fut = inflight.popleft()
+            yield c0, fut.result()
+
+    # chunks are independent HTTP calls: keep up to LLM_CONCURRENCY in flight (still bounded by rpm)
+    # and consume the replies in order so the CSV checkpoints and progress stay sequential
+    width = min(LLM_CONCURRENCY, len(chunks))
+    with ThreadPoolExecutor(max_workers=width) as pool:
+        for idx, ((ids, user_msg), parsed) in enumerate(_in_order(pool, width), start=1):
+            missing = [rid for rid in ids if rid not in parsed]
+            if missing:
+                frame = todo.set_index("id").loc[missing]
+                sub_chunks = _build_chunks(frame.reset_index()[["id","text","cache_sig"]])
+                passes = 0
+                for _ids, _user in sub_chunks:
+                    if not missing or (cancel is not None and cancel.is_set()): break
+                    passes += 1
+                    got = _request(_ids, _user)
+                    parsed.update(got)
+                    missing = [rid for rid in ids if rid not in parsed]
+                    if passes >= 2 and missing:
+                        break
+
+            # only real model answers are cached, not the neutral fill-ins below
+            _llm_cache_put([(_llm_cache_key(model, text_map[rid]), parsed[rid]) for rid in ids if rid in parsed and rid in text_map])
+
+            # update any missing ids
+            for rid in ids:
+                if rid not in parsed:
+                    parsed[rid] = {"id": rid, "llm_label": "neutral", "llm_score": 0.0, "llm_sarcasm": False, "llm_ethics": "none"}
+
+            rows = [parsed[rid] for rid in ids]
+            chunk_df = pd.DataFrame(rows)
+            chunk_df["cache_sig"] = chunk_df["id"].map(sig_map).astype(str)
+            chunk_df["model"] = model
+
+            keys = list(zip(chunk_df["id"].astype(int), chunk_df["cache_sig"]))
+            chunk_df = chunk_df.loc[[k not in pre for k in keys]]
+            pre.update(keys)
+
+            parts.append(chunk_df)
+            chunk_df[out_cols].to_csv(out_path, mode="a", header=False, index=False)
+            _emit(idx, planned_calls)
+
+    df_out = pd.concat(parts, ignore_index=True)
+
+    if not repeats.empty:
+        # same text means same cache_sig, so (first id, sig) finds the answered row
+        first_id = dict(zip(todo["text"], todo["id"].astype(int)))
+        answered = df_out.drop_duplicates(["id","cache_sig"], keep="last").set_index(["id","cache_sig"])
+        keys = pd.MultiIndex.from_arrays([repeats["text"].map(first_id), repeats["cache_sig"].astype(str)])
+        # a cancelled run may stop before a first occurrence is answered; its repeats stay unlabeled too
+        hit = keys.isin(answered.index)
+        repeats = repeats.loc[hit]
+        rep_df = answered.loc[keys[hit], ["llm_label","llm_score","llm_sarcasm","llm_ethics"]].reset_index(drop=True)
+        rep_df.insert(0, "id", repeats["id"].astype(int).to_numpy())
+        rep_df["cache_sig"] = repeats["cache_sig"].astype(str).to_numpy()
+        df_out = pd.concat([df_out, rep_df], ignore_index=True)
+    _write_csv(out_path, df_out[out_cols])
 
     df_out["model"] = model
     return df_out[["id","llm_label","llm_score","llm_sarcasm","llm_ethics","cache_sig","model"]]
@@ -1042,11 +1419,11 @@ def _weighted_f1(y_true: List[str], y_pred: List[str], labels=("negative","neutr
         f1s.append(f1); weights.append(w)
     return float(sum(f*w for f,w in zip(f1s,weights)) / (sum(weights)+eps))
 
-def _accuracy(y_true: List[str], y_pred: List[str]) -> float:
-    n = len(y_true)
-    if n == 0: return 0.0
-    eq = sum(1 for a,b in zip(y_true, y_pred) if a == b)
-    return eq / n
+def _accuracy(y_true: Iterable, y_pred: Iterable) -> float:
+    yt = y_true if isinstance(y_true, np.ndarray) else np.asarray(y_true, dtype=object)
+    yp = y_pred if isinstance(y_pred, np.ndarray) else np.asarray(y_pred, dtype=object)
+    if len(yt) == 0: return 0.0
+    return float((yt == yp).mean())
 
 def _cohen_kappa(y_true: List[str], y_pred: List[str], labels=("negative","neutral","positive")) -> float:
     # κ = (po - pe) / (1 - pe)
@@ -1077,7 +1454,7 @@ def _mcc_multiclass(y_true: List[str], y_pred: List[str], labels=("negative","ne
 
 def _spearman(x: List[float], y: List[float]) -> float:
     import math
-    if not x or not y or len(x)!=len(y): return 0.0
+    if len(x) == 0 or len(y) == 0 or len(x)!=len(y): return 0.0
     n=len(x)
     rx=pd.Series(x).rank(method="average")
     ry=pd.Series(y).rank(method="average")
@@ -1086,6 +1463,60 @@ def _spearman(x: List[float], y: List[float]) -> float:
     if stdx==0 or stdy==0: return 0.0
     return float(cov/(stdx*stdy))
 
+def _label_codes(y_true: pd.Series, y_pred: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Jointly encode two label columns as integer codes: 0..2 for SENTIMENT_LABELS, 3+ for any other value
+    """
+    if y_true.dtype == LABEL_DTYPE and y_pred.dtype == LABEL_DTYPE and not (y_true.isna().any() or y_pred.isna().any()):
+        return y_true.cat.codes.to_numpy(np.int64), y_pred.cat.codes.to_numpy(np.int64)
+    both = pd.concat([y_true, y_pred], ignore_index=True).astype(str)
+    extra = sorted(set(both.unique()) - set(SENTIMENT_LABELS))
+    codes = pd.Categorical(both, categories=list(SENTIMENT_LABELS) + extra).codes.astype(np.int64)
+    n = len(y_true)
+    return codes[:n], codes[n:]
+
+def _metrics_from_codes(yt: np.ndarray, yp: np.ndarray) -> Tuple[np.ndarray, float, float, float, float, float]:
+    """
+    Confusion matrix, accuracy, macro F1, weighted F1, kappa and MCC from label codes in one counting pass.
+    Mirrors _accuracy/_prf1/_weighted_f1/_cohen_kappa/_mcc_multiclass.
+    """
+    k = len(SENTIMENT_LABELS)
+    n = len(yt)
+    eps = 1e-9
+    valid = (yt < k) & (yp < k)
+    cm = np.bincount(yt[valid] * k + yp[valid], minlength=k * k).reshape(k, k)
+    if n == 0:
+        return cm, 0.0, 0.0, 0.0, 0.0, 0.0
+    # per-class totals over all rows, out-of-label values included
+    true_n = np.bincount(yt[yt < k], minlength=k)
+    pred_n = np.bincount(yp[yp < k], minlength=k)
+
+    acc = int(np.count_nonzero(yt == yp)) / n
+
+    precs = []; recs = []; f1s = []
+    for i in range(k):
+        tp = int(cm[i, i])
+        prec = tp / (int(pred_n[i]) + eps)
+        rec  = tp / (int(true_n[i]) + eps)
+        precs.append(prec); recs.append(rec)
+        f1s.append(2*prec*rec / (prec+rec+eps))
+    macro_p = sum(precs)/k
+    macro_r = sum(recs)/k
+    mf1 = 2*macro_p*macro_r / (macro_p+macro_r+eps)
+    wf1 = float(sum(f*int(w) for f,w in zip(f1s,true_n)) / (int(true_n.sum())+eps))
+
+    pe = sum((int(true_n[i])/n)*(int(pred_n[i])/n) for i in range(k))
+    kappa = 0.0 if pe == 1.0 else (acc - pe) / (1 - pe + 1e-9)
+
+    t = int(np.trace(cm))
+    p = [int(x) for x in cm.sum(axis=1)]
+    q = [int(x) for x in cm.sum(axis=0)]
+    c = sum(p)
+    s = sum(p[i]*q[i] for i in range(k))
+    denom = ((c**2 - sum(p_i**2 for p_i in p))*(c**2 - sum(q_i**2 for q_i in q)))**0.5
+    mcc = 0.0 if denom == 0 else (t*c - s) / (denom + 1e-9)
+    return cm, acc, mf1, wf1, kappa, mcc
+
 def _standardize_llm_df(llm_df: pd.DataFrame) -> pd.DataFrame:
     """
     Standardize LLM scores
@@ -1127,16 +1558,11 @@ def _standardize_llm_df(llm_df: pd.DataFrame) -> pd.DataFrame:
     else:
         s = pd.to_numeric(df[scr_col], errors="coerce").fillna(0.0)
 
-    def _align(row):
-        lab = row["llm_label"]
-        val = float(row["raw_score"])
-        if lab == "neutral":
-            return 0.0
-        if lab == "positive":
-            return abs(val)
-        return -abs(val)  # negative
-    df = df.assign(raw_score=s)
-    df["llm_score"] = df.apply(_align, axis=1).clip(-1.0, 1.0)
+    # align the score's sign with the label: neutral -> 0, positive -> |s|, negative -> -|s|
+    lab = df["llm_label"].to_numpy(dtype=object)
+    mag = np.abs(s.to_numpy(dtype=float))
+    aligned = np.select([lab == "neutral", lab == "positive"], [0.0, mag], default=-mag)
+    df["llm_score"] = pd.Series(aligned, index=df.index).clip(-1.0, 1.0)
     return df[["id", "llm_label", "llm_score"]].copy()
 
 def evaluate_model(base_scored: pd.DataFrame, llm_df: pd.DataFrame) -> Dict[str, Any]:
@@ -1149,20 +1575,20 @@ def evaluate_model(base_scored: pd.DataFrame, llm_df: pd.DataFrame) -> Dict[str,
     if merged.empty:
         return {"empty": True}
 
-    y_true = list(merged["vader_label"])
-    y_pred = list(merged["llm_label"])
+    y_true = merged["vader_label"].to_numpy(dtype=object)
+    y_pred = merged["llm_label"].to_numpy(dtype=object)
 
     acc = _accuracy(y_true, y_pred)
     mp, mr, mf1 = _prf1(y_true, y_pred)
     wf1 = _weighted_f1(y_true, y_pred)
     kappa = _cohen_kappa(y_true, y_pred)
     mcc = _mcc_multiclass(y_true, y_pred)
-    rho = _spearman(list(merged["vader"]), list(merged["llm_score"]))
+    rho = _spearman(merged["vader"].to_numpy(), merged["llm_score"].to_numpy())
     cm = _confusion(y_true, y_pred)
 
     per_platform = []
     for plat, g in merged.groupby("platform"):
-        y_t = list(g["vader_label"]); y_p = list(g["llm_label"])
+        y_t = g["vader_label"].to_numpy(dtype=object); y_p = g["llm_label"].to_numpy(dtype=object)
         per_platform.append({
             "platform": plat,
             "n": len(g),
@@ -1171,7 +1597,7 @@ def evaluate_model(base_scored: pd.DataFrame, llm_df: pd.DataFrame) -> Dict[str,
             "weighted_f1": _weighted_f1(y_t, y_p),
             "kappa": _cohen_kappa(y_t, y_p),
             "mcc": _mcc_multiclass(y_t, y_p),
-            "spearman_rho": _spearman(list(g["vader"]), list(g["llm_score"])),
+            "spearman_rho": _spearman(g["vader"].to_numpy(), g["llm_score"].to_numpy()),
         })
 
     return {
@@ -1217,6 +1643,8 @@ def _hydrate_session_from_disk():
 
     if not sc.empty:
         # scored value must be prioritized
+        if "vader_label" in sc.columns:
+            sc["vader_label"] = _as_label_cat(sc["vader_label"])
         st.session_state.df_scored = sc
         base_frames = [df for df in (yt, tw) if not df.empty]
         if base_frames:
@@ -1313,6 +1741,9 @@ def _render_llm_compare_wide(base_df: pd.DataFrame, labeled_by_model: Dict[str,
     wide["likes"] = pd.to_numeric(wide.get("likes"), errors="coerce").fillna(0).astype(int)
     wide["vader_score"] = pd.to_numeric(wide.get("vader_score"), errors="coerce")
 
+    for col in [c for c in wide.columns if c.endswith("_label")]:
+        wide[col] = _as_label_cat(wide[col])
+
     wide = wide.sort_values(["id"]).drop_duplicates(subset=["id"], keep="last").reset_index(drop=True)
     return wide
 
@@ -1542,6 +1973,7 @@ def _write_dashboard_from_wide(wide: "pd.DataFrame", out_html: "Path") -> str:
     import pandas as pd, json
 
     df = wide.copy()
+    _ROWS = "__rows__"  # placeholder for per-row chart data, filled in by _spec_json
 
     def _norm(s: "pd.Series") -> "pd.Series":
         return (s.astype(str).str.strip().str.lower()
@@ -1562,24 +1994,25 @@ def _write_dashboard_from_wide(wide: "pd.DataFrame", out_html: "Path") -> str:
 
     # Ethical tags by descending sentiment frequency
     ethics_col = next((c for c in ["Hermes_ethics","Qwen_ethics","Llama_ethics"] if _has(c)), None)
-    c1_vals = []
+    c1_vals = pd.DataFrame(columns=["ethics","sentiment","n"])
     if ethics_col and primary_lab:
-        labs = _norm(df[primary_lab])
-        for tags, lab in zip(df[ethics_col].fillna("none").astype(str), labs):
-            for t in [x.strip() for x in tags.split(",") if x.strip()]:
-                c1_vals.append({"ethics": t, "sentiment": lab})
+        c1 = pd.DataFrame({"ethics": df[ethics_col].fillna("none").astype(str).str.split(","),
+                           "sentiment": _norm(df[primary_lab])}).explode("ethics")
+        c1["ethics"] = c1["ethics"].str.strip()
+        # one row per (tag, sentiment) with its count, so the chart sums n instead of counting raw rows
+        c1_vals = c1[c1["ethics"] != ""].groupby(["ethics","sentiment"], sort=False).size().reset_index(name="n")
 
     spec_c1 = {
         "$schema": "https://vega.github.io/schema/vega-lite/v5.json",
-        "data": {"values": c1_vals},
+        "data": {"values": _ROWS},
         "title": {"text": "Ethics tags by sentiment"},
         "mark": "bar",
         "encoding": {
             "x": {"field": "ethics", "type": "nominal", "sort": "-y", "title": None},
-            "y": {"aggregate": "count", "title": "Count"},
+            "y": {"aggregate": "sum", "field": "n", "title": "Count"},
             "color": {"field": "sentiment", "type": "nominal", "title": None},
             "tooltip": [
-                {"aggregate":"count","title":"rows"},
+                {"aggregate":"sum","field":"n","title":"rows"},
                 {"field":"ethics","type":"nominal"},
                 {"field":"sentiment","type":"nominal"}
             ],
@@ -1614,14 +2047,14 @@ def _write_dashboard_from_wide(wide: "pd.DataFrame", out_html: "Path") -> str:
     }
 
     # Likes vs polarity scatter plot
-    c3_vals = []
+    c3_vals = pd.DataFrame(columns=["polarity","likes","label"])
     if primary_lab:
-        for pol, likes, lab in zip(df["vader_score"], df["likes"], _norm(df[primary_lab])):
-            c3_vals.append({"polarity": float(pol), "likes": float(likes), "label": lab})
+        c3_vals = pd.DataFrame({"polarity": df["vader_score"].astype(float), "likes": df["likes"].astype(float),
+                                "label": _norm(df[primary_lab])})
 
     spec_c3 = {
         "$schema": "https://vega.github.io/schema/vega-lite/v5.json",
-        "data": {"values": c3_vals},
+        "data": {"values": _ROWS},
         "title": {"text": "Likes vs polarity"},
         "mark": {"type":"point"},
         "encoding": {
@@ -1639,21 +2072,22 @@ def _write_dashboard_from_wide(wide: "pd.DataFrame", out_html: "Path") -> str:
 
     # Stacked VADER score histogram
     stack_lab = "vader_label" if _has("vader_label") else primary_lab
-    c4_vals = []
+    c4_vals = pd.DataFrame(columns=["score","label","n"])
     if stack_lab:
-        for pol, lab in zip(df["vader_score"], _norm(df[stack_lab])):
-            c4_vals.append({"score": float(pol), "label": lab})
+        # binning stays in Vega-Lite (same bin edges); repeated scores are collapsed into counts first
+        c4_vals = (pd.DataFrame({"score": df["vader_score"].astype(float), "label": _norm(df[stack_lab])})
+                     .groupby(["score","label"], sort=False).size().reset_index(name="n"))
 
     spec_c4 = {
         "$schema": "https://vega.github.io/schema/vega-lite/v5.json",
-        "data": {"values": c4_vals},
+        "data": {"values": _ROWS},
         "title": {"text": "VADER score histogram"},
         "mark": "bar",
         "encoding": {
             "x": {"bin":{"maxbins":24}, "field":"score", "type":"quantitative", "title":"score (binned)"},
-            "y": {"aggregate":"count","title":"Count"},
+            "y": {"aggregate":"sum","field":"n","title":"Count"},
             "color": {"field":"label","type":"nominal","title": None},
-            "tooltip": [{"aggregate":"count","title":"rows"},{"field":"label","type":"nominal"}]
+            "tooltip": [{"aggregate":"sum","field":"n","title":"rows"},{"field":"label","type":"nominal"}]
         },
         "width": 680, "height": 380
     }
@@ -1662,6 +2096,12 @@ def _write_dashboard_from_wide(wide: "pd.DataFrame", out_html: "Path") -> str:
     table_cols = [c for c in df.columns if c not in ("author","authorLink","username","user","handle","link","channel")]
     table_html = df[table_cols].to_html(index=False)
 
+    def _spec_json(spec: dict, rows: "pd.DataFrame") -> str:
+        # chart rows are inlined as one CSV string (field names once, not per row) and numeric columns parsed back by Vega
+        parse = {c: "number" for c in rows.columns if pd.api.types.is_numeric_dtype(rows[c])}
+        data = {"values": rows.to_csv(index=False, lineterminator="\n"), "format": {"type": "csv", "parse": parse}}
+        return json.dumps({**spec, "data": data}, ensure_ascii=False)
+
     # Vega-Lite based HTML Template
     html = f"""<!doctype html>
 <html>
@@ -1688,10 +2128,10 @@ def _write_dashboard_from_wide(wide: "pd.DataFrame", out_html: "Path") -> str:
   </div>
 
   <script>
-    const spec1 = {json.dumps(spec_c1, ensure_ascii=False)};
+    const spec1 = {_spec_json(spec_c1, c1_vals)};
     const spec2 = {json.dumps(spec_c2, ensure_ascii=False)};
-    const spec3 = {json.dumps(spec_c3, ensure_ascii=False)};
-    const spec4 = {json.dumps(spec_c4, ensure_ascii=False)};
+    const spec3 = {_spec_json(spec_c3, c3_vals)};
+    const spec4 = {_spec_json(spec_c4, c4_vals)};
     vegaEmbed('#chart_1', spec1, {{actions:false}});
     vegaEmbed('#chart_2', spec2, {{actions:false}});
     vegaEmbed('#chart_3', spec3, {{actions:false}});
@@ -1746,39 +2186,6 @@ def _load_ground_truth(path: Path) -> pd.DataFrame:
     return gt[["id","text","Human_sarcasm","Human_label","Human_ethics"]]
 
 
-def _save_ground_truth(df_in: pd.DataFrame, path: Path) -> None:
-    out = df_in.copy()
-
-    out["id"] = pd.to_numeric(out["id"], errors="coerce").fillna(0).astype(int)
-    out["text"] = out.get("text", "").astype(str)
-    out["Human_sarcasm"] = out.get("Human_sarcasm", False).fillna(False).astype(bool)
-
-    # map values to sentiment labels {positive,neutral,negative,""}
-    out["Human_label"] = (
-        out.get("Human_label", "")
-           .astype(str).str.strip().str.lower()
-           .map({"pos":"positive","positive":"positive",
-                 "neu":"neutral","neutral":"neutral",
-                 "neg":"negative","negative":"negative"}).fillna("")
-    )
-
-    def _serialize(v: Any) -> str:
-        items = _coerce_ethics_list(v)
-        if "none" in set(items):
-            return "none"
-        items = [str(x).strip().lower() for x in items if str(x).strip()]
-        return ",".join(sorted(dict.fromkeys(items), key=str.lower)) or "none"
-
-    out["Human_ethics"] = out.get("Human_ethics", []).apply(_serialize)
-
-    out = out.sort_values("id").drop_duplicates("id", keep="last")
-    path.parent.mkdir(parents=True, exist_ok=True)
-    out.to_csv(path, index=False, encoding="utf-8")
-
-    mem = out.copy()
-    mem["Human_ethics"] = mem["Human_ethics"].apply(_coerce_ethics_list)
-    st.session_state._gt_mem = mem
-
 def _canon_ground_truth(df: pd.DataFrame) -> pd.DataFrame:
     g = df.copy()
 
@@ -1831,16 +2238,39 @@ def _wide_from_session() -> pd.DataFrame | None:
             return df.copy()
     return None
 
+def _frame_digest(frames: Iterable[pd.DataFrame | None], *keys: str) -> str:
+    """
+    Stable content hash of a group of frames, used to key cached results across reruns
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for k in keys:
+        h.update(str(k).encode("utf-8") + b"\0")
+    for df in frames:
+        if df is None or df.empty:
+            h.update(b"\0")
+            continue
+        h.update("|".join(map(str, df.columns)).encode("utf-8"))
+        try:
+            rows = pd.util.hash_pandas_object(df, index=False)
+        except TypeError:
+            # unhashable cells (e.g. ethics lists) hash by their string form
+            rows = pd.util.hash_pandas_object(df.astype(str), index=False)
+        h.update(rows.to_numpy().tobytes())
+    return h.hexdigest()
+
 def _get_wide(force_rebuild: bool = False) -> pd.DataFrame:
     ss = st.session_state
-    if not force_rebuild and isinstance(ss.get("wide"), pd.DataFrame) and not ss["wide"].empty:
-        return ss["wide"]
 
     df_scored: pd.DataFrame | None = ss.get("df_scored")
     llm_labels: dict | None     = ss.get("llm_labels")
 
+    sig = _frame_digest([df_scored, *(llm_labels or {}).values()], *(llm_labels or {}).keys())
+    if not force_rebuild and ss.get("_wide_sig") == sig and isinstance(ss.get("wide"), pd.DataFrame) and not ss["wide"].empty:
+        return ss["wide"]
+
     if isinstance(df_scored, pd.DataFrame) and not df_scored.empty and llm_labels:
         wide = _render_llm_compare_wide(df_scored, llm_labels)
+        ss["_wide_sig"] = sig
         ss["wide"] = wide
         ss["final_wide"] = wide
         ss["scored_wide"] = wide
@@ -1861,12 +2291,21 @@ def _render_export_tab():
         st.error(str(e))
         return
 
-    # Export download files
-    scored_csv = wide.to_csv(index=False, encoding="utf-8")
-    html_str = _write_dashboard_from_wide(wide, APP_OUTDIR / "dashboard.html")
-    tabs_zip = _build_tab_csv_bundle(wide)
-    conf_zip = _build_all_confusions_zip(wide)
-    perplat_zip = _build_model_platform_results_zip(wide)
+    # Export download files, rebuilt only when the wide frame or the ground truth the bundles fall back on changes
+    ss = st.session_state
+    gt_mem = ss.get("_gt_mem") if isinstance(ss.get("_gt_mem"), pd.DataFrame) else None
+    gt_stamp = [f"{p}:{p.stat().st_mtime_ns}:{p.stat().st_size}" for p in (APP_OUTDIR / "ground_truth.csv", Path("ground_truth.csv")) if p.exists()]
+    sig = _frame_digest([wide, gt_mem], *wide.columns, *gt_stamp)
+    if ss.get("_export_sig") != sig or "_export_files" not in ss:
+        ss["_export_files"] = (
+            wide.to_csv(index=False, encoding="utf-8"),
+            _write_dashboard_from_wide(wide, APP_OUTDIR / "dashboard.html"),
+            _build_tab_csv_bundle(wide),
+            _build_all_confusions_zip(wide),
+            _build_model_platform_results_zip(wide),
+        )
+        ss["_export_sig"] = sig
+    scored_csv, html_str, tabs_zip, conf_zip, perplat_zip = ss["_export_files"]
 
     cols = st.columns(4)
     with cols[0]:
@@ -1918,35 +2357,6 @@ def _show_llm_compare_table(wide_df: pd.DataFrame):
             cfg[c] = st.column_config.CheckboxColumn(c, help="Model marked this text as sarcastic", default=False, disabled=True)
     st.dataframe(wide_df, width='stretch', height=520, column_config=cfg)
 
-def _collect_ethics_options(wide_df: pd.DataFrame) -> list[str]:
-    vals: set[str] = set(ETHICS_CODES_FULL)
-
-    # LLM model outputs
-    for c in [x for x in wide_df.columns if x.endswith("_ethics")]:
-        for s in wide_df[c].dropna().astype(str):
-            for t in s.split(","):
-                k = str(t).strip().lower()
-                if k:
-                    vals.add(k)
-
-    gt_mem = st.session_state.get("_gt_mem")
-    if isinstance(gt_mem, pd.DataFrame) and "Human_ethics" in gt_mem.columns:
-        for cell in gt_mem["Human_ethics"]:
-            if isinstance(cell, list):
-                for t in cell:
-                    k = str(t).strip().lower()
-                    if k:
-                        vals.add(k)
-            else:
-                for t in str(cell or "").split(","):
-                    k = str(t).strip().lower()
-                    if k:
-                        vals.add(k)
-
-    vals.add("none")
-    return sorted(vals, key=str.lower)
-
-
 def _save_ground_truth(df_in: pd.DataFrame, path: Path) -> None:
     out = df_in.copy()
 
@@ -2067,48 +2477,170 @@ def _coerce_ethics_list(v: Any) -> list[str]:
     else:
         s = str(v or "").strip()
         items = [] if not s or s.lower() == "nan" else [t for t in s.split(",") if t.strip()]
-    out, seen = [], set()
-    for t in items:
-        k = str(t).strip().lower()
-        if k and k not in seen:
-            seen.add(k); out.append(k)
-    if not out or "none" in seen:
+    out = list(dict.fromkeys(k for k in (str(t).strip().lower() for t in items) if k))
+    if not out or "none" in out:
         return ["none"]
     return out
 
 def _collect_ethics_options(wide_df: pd.DataFrame) -> list[str]:
-    vals: set[str] = set(ETHICS_CODES_FULL)
-
-    # from LLM model outputs
-    for c in [x for x in wide_df.columns if x.endswith("_ethics")]:
-        for s in wide_df[c].dropna().astype(str):
-            for t in s.split(","):
-                k = str(t).strip().lower()
-                if k:
-                    vals.add(k)
+    # from LLM model outputs; each distinct cell is split once
+    toks = [t for c in wide_df.columns if c.endswith("_ethics")
+              for s in wide_df[c].dropna().astype(str).unique() for t in s.split(",")]
 
     gt_mem = st.session_state.get("_gt_mem")
     if isinstance(gt_mem, pd.DataFrame) and "Human_ethics" in gt_mem.columns:
         for cell in gt_mem["Human_ethics"].tolist():
-            if isinstance(cell, list):
-                for t in cell:
-                    k = str(t).strip().lower()
-                    if k:
-                        vals.add(k)
-            else:
-                for t in str(cell or "").split(","):
-                    k = str(t).strip().lower()
-                    if k:
-                        vals.add(k)
+            toks.extend(cell if isinstance(cell, list) else str(cell or "").split(","))
 
-    custom = st.session_state.get("_custom_ethics", [])
-    for t in custom:
-        k = str(t).strip().lower()
-        if k:
-            vals.add(k)
+    toks.extend(st.session_state.get("_custom_ethics", []))
 
+    vals: set[str] = set(ETHICS_CODES_FULL)
+    vals.update(k for k in (str(t).strip().lower() for t in toks) if k)
     return sorted(vals, key=str.lower)
 
+def _on_uniques(s: pd.Series, fn) -> pd.Series:
+    """
+    Apply a column normalizer to the distinct values of s only and broadcast the result back by factorized code
+    """
+    # label/flag/ethics columns hold a handful of distinct values, so this turns O(rows) string work into O(uniques)
+    try:
+        codes, uniq = pd.factorize(s, use_na_sentinel=False)
+    except TypeError:  # unhashable cells (e.g. lists)
+        return fn(s)
+    out = fn(pd.Series(uniq, dtype=s.dtype)).take(codes)
+    out.index = s.index
+    return out
+
+def _norm_label_series(s: pd.Series) -> pd.Series:
+    def _norm(v: pd.Series) -> pd.Series:
+        v = v.astype(str).str.strip().str.lower()
+        return v.replace({"neg":"negative","neu":"neutral","pos":"positive","":"neutral","none":"neutral"})
+    return _on_uniques(s, _norm)
+
+def _norm_bool_series(s: pd.Series) -> pd.Series:
+    return _on_uniques(s, lambda v: v.astype(str).str.strip().str.lower().isin({"1","true","y","yes","t"}))
+
+def _norm_ethics_series(s: pd.Series) -> pd.Series:
+    return _on_uniques(s, lambda v: v.map(_norm_ethics_cell))
+
+def _norm_ethics_cell(x: str) -> str:
+    allow = {"none","bias","privacy","transparency","job_displacement","safety",
+             "governance","misinformation","accountability","other"}
+    toks = [t.strip().lower() for t in str(x).replace(";",",").replace("|",",").split(",") if t.strip()]
+    toks = [t for t in toks if t in allow]
+    if not toks or "none" in toks: return "none"
+    return ",".join(sorted(set(toks)))
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _prep_eval(sig: str, _base: pd.DataFrame, _llm_labels: Dict[str, pd.DataFrame], _gt: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build the Evaluation wide table once per content hash: ground truth merged, label columns normalized
+    """
+    base = _base.copy()
+    if "vader" in base.columns and "vader_score" not in base.columns:
+        base = base.rename(columns={"vader":"vader_score"})
+    if "vader_label" not in base.columns and "vader_score" in base.columns:
+        base["vader_label"] = _vader_labels(base["vader_score"])
+
+    wide = _render_llm_compare_wide(base, _llm_labels)
+
+    gt = _gt.copy()
+    gt["id"] = pd.to_numeric(gt["id"], errors="coerce").fillna(0).astype(int)
+    gt["Human_label"] = _norm_label_series(gt["Human_label"])
+    gt["Human_sarcasm"] = _norm_bool_series(gt["Human_sarcasm"]) if "Human_sarcasm" in gt.columns else False
+    gt["Human_ethics"] = _norm_ethics_series(gt["Human_ethics"]) if "Human_ethics" in gt.columns else "none"
+
+    wide = wide.merge(gt[["id","Human_label","Human_sarcasm","Human_ethics"]], on="id", how="left")
+
+    # normalize every model label column up front; missing labels stay NaN for the per-model dropna
+    for col in [c for c in wide.columns if c.endswith("_label") and c != "Human_label"]:
+        if wide[col].dtype != LABEL_DTYPE:
+            wide[col] = wide[col].where(wide[col].isna(), _norm_label_series(wide[col]))
+        wide[col] = _as_label_cat(wide[col])
+    wide["Human_label"] = _as_label_cat(wide["Human_label"])
+    return wide
+
+def _safe_model_tags(df: pd.DataFrame) -> list[str]:
+    tags=[]
+    for tag in ["Qwen","Llama","Hermes"]:
+        if f"{tag}_label" in df.columns: tags.append(tag)
+    if "vader_label" in df.columns: tags.append("VADER")
+    return tags
+
+def _confusion_frame(cm: np.ndarray) -> pd.DataFrame:
+    return pd.DataFrame(cm, index=list(SENTIMENT_LABELS), columns=list(SENTIMENT_LABELS))
+
+def _jaccard_lists(pred: str, human: str) -> float:
+    p = {t for t in str(pred).split(",") if t and t != "none"}
+    h = {t for t in str(human).split(",") if t and t != "none"}
+    if not p and not h: return 1.0
+    if not p or not h:  return 0.0
+    return len(p & h) / float(len(p | h))
+
+def _ethics_jaccard(pred: pd.Series, human: pd.Series) -> np.ndarray:
+    """
+    Row-wise Jaccard of normalized ethics strings, computed once per distinct (pred, human) pair and broadcast back
+    """
+    codes, pairs = pd.MultiIndex.from_arrays([pred.astype(str), human.astype(str)]).factorize()
+    return np.array([_jaccard_lists(p, h) for p, h in pairs], dtype=float)[codes]
+
+def _eval_one(tag: str, wide: pd.DataFrame) -> Tuple[Dict[str, Any], np.ndarray]:
+    """
+    Evaluate a single model against Human_label: overall metrics row and raw 3x3 confusion counts
+    """
+    lab_col = "vader_label" if tag == "VADER" else f"{tag}_label"
+    sub = wide[["platform","Human_label", lab_col]].dropna(subset=[lab_col, "Human_label"])
+    y_t, y_p = _label_codes(sub["Human_label"], sub[lab_col])
+    cm, acc, mf1, wf1, kappa, mcc = _metrics_from_codes(y_t, y_p)
+
+    if tag != "VADER" and f"{tag}_sarcasm" in wide.columns and "Human_sarcasm" in wide.columns:
+        ssub = wide[[f"{tag}_sarcasm", "Human_sarcasm"]].dropna()
+        sarcasm_acc = float(np.mean(np.array(_norm_bool_series(ssub[f"{tag}_sarcasm"])) == np.array(_norm_bool_series(ssub["Human_sarcasm"])))) if len(ssub) else float("nan")
+    else:
+        sarcasm_acc = float("nan")
+    if tag != "VADER" and f"{tag}_ethics" in wide.columns and "Human_ethics" in wide.columns:
+        ej = _ethics_jaccard(_norm_ethics_series(wide[f"{tag}_ethics"]), _norm_ethics_series(wide["Human_ethics"]))
+        ethics_j = float(np.mean(ej)) if len(ej) else float("nan")
+    else:
+        ethics_j = float("nan")
+
+    metrics_row = {
+        "model": tag, "n": len(sub),
+        "accuracy": round(acc,6),
+        "macro_f1": round(mf1,6),
+        "weighted_f1": round(wf1,6),
+        "kappa": round(kappa,6),
+        "mcc": round(mcc,6),
+        "sarcasm_acc": None if np.isnan(sarcasm_acc) else round(float(sarcasm_acc),6),
+        "ethics_jaccard": None if np.isnan(ethics_j) else round(float(ethics_j),6),
+    }
+
+    return metrics_row, cm
+
+def _per_platform_cube(wide: pd.DataFrame, tags: List[str]) -> pd.DataFrame:
+    """
+    Per-model x per-platform label counts and accuracy from one long-format groupby
+    """
+    cols = {("vader_label" if t == "VADER" else f"{t}_label"): t for t in tags}
+    out_cols = ["model","platform","n","neg","neu","pos","acc"]
+    if not cols:
+        return pd.DataFrame(columns=out_cols)
+    long = (wide.melt(id_vars=["platform","Human_label"], value_vars=list(cols), var_name="model", value_name="pred")
+                .dropna(subset=["pred","Human_label"]))
+    long = long.assign(
+        model=long["model"].map(cols),
+        platform=long["platform"].astype(str).str.strip().str.lower(),
+        neg=long["pred"].eq("negative"),
+        neu=long["pred"].eq("neutral"),
+        pos=long["pred"].eq("positive"),
+        hit=long["pred"].eq(long["Human_label"]),
+    )
+    cube = (long.groupby(["model","platform"], sort=False)
+                .agg(n=("pred","size"), neg=("neg","sum"), neu=("neu","sum"), pos=("pos","sum"), acc=("hit","mean"))
+                .reset_index())
+    cube["acc"] = cube["acc"].map(lambda v: round(float(v), 6))
+    return cube[out_cols]
+
 def _render_benchmark_tab() -> None:
     import numpy as np
     import pandas as pd
@@ -2126,69 +2658,21 @@ def _render_benchmark_tab() -> None:
       h2, h3 { margin: 0.35rem 0 0.5rem 0; }
     </style>
     """, unsafe_allow_html=True)
-    
-    def _norm_label_series(s: pd.Series) -> pd.Series:
-        v = s.astype(str).str.strip().str.lower()
-        return v.replace({"neg":"negative","neu":"neutral","pos":"positive","":"neutral","none":"neutral"})
-
-    def _norm_bool_series(s: pd.Series) -> pd.Series:
-        return s.astype(str).str.strip().str.lower().isin({"1","true","y","yes","t"})
-
-    def _norm_ethics_cell(x: str) -> str:
-        allow = {"none","bias","privacy","transparency","job_displacement","safety",
-                 "governance","misinformation","accountability","other"}
-        toks = [t.strip().lower() for t in str(x).replace(";",",").replace("|",",").split(",") if t.strip()]
-        toks = [t for t in toks if t in allow]
-        if not toks or "none" in toks: return "none"
-        return ",".join(sorted(set(toks)))
-
-    def _safe_model_tags(df: pd.DataFrame) -> list[str]:
-        tags=[]
-        for tag in ["Qwen","Llama","Hermes"]:
-            if f"{tag}_label" in df.columns: tags.append(tag)
-        if "vader_label" in df.columns: tags.append("VADER")
-        return tags
-
-    def _confusion(y_true, y_pred, labels=("negative","neutral","positive")) -> pd.DataFrame:
-        idx = {lab:i for i,lab in enumerate(labels)}
-        m = np.zeros((3,3), dtype=int)
-        for a,b in zip(y_true, y_pred):
-            ia = idx.get(str(a)); ib = idx.get(str(b))
-            if ia is not None and ib is not None: m[ia, ib] += 1
-        return pd.DataFrame(m, index=["negative","neutral","positive"], columns=["negative","neutral","positive"])
-
-    def _jaccard_lists(pred: str, human: str) -> float:
-        p = {t for t in str(pred).split(",") if t and t != "none"}
-        h = {t for t in str(human).split(",") if t and t != "none"}
-        if not p and not h: return 1.0
-        if not p or not h:  return 0.0
-        return len(p & h) / float(len(p | h))
 
     # scored data
-    base = st.session_state.df_scored.copy() if not st.session_state.df_scored.empty else st.session_state.df_all.copy()
+    base = st.session_state.df_scored if not st.session_state.df_scored.empty else st.session_state.df_all
     if base.empty:
         st.warning("No scored data found."); return
 
-    if "vader" in base.columns and "vader_score" not in base.columns:
-        base = base.rename(columns={"vader":"vader_score"})
-    if "vader_label" not in base.columns and "vader_score" in base.columns:
-        base["vader_label"] = base["vader_score"].apply(label_from_vader)
-
-    wide = _render_llm_compare_wide(base, st.session_state.llm_labels)
-
     gt = safe_read_csv(outdir / "ground_truth.csv")
     if gt.empty and Path("ground_truth.csv").exists():
         gt = safe_read_csv(Path("ground_truth.csv"))
     if gt.empty or not {"id","Human_label"} <= set(gt.columns):
         st.error("Ground-truth not found. Expected: id, Human_label[, Human_sarcasm, Human_ethics]."); return
 
-    gt = gt.copy()
-    gt["id"] = pd.to_numeric(gt["id"], errors="coerce").fillna(0).astype(int)
-    gt["Human_label"] = _norm_label_series(gt["Human_label"])
-    gt["Human_sarcasm"] = _norm_bool_series(gt["Human_sarcasm"]) if "Human_sarcasm" in gt.columns else False
-    gt["Human_ethics"] = gt["Human_ethics"].map(_norm_ethics_cell) if "Human_ethics" in gt.columns else "none"
-
-    wide = wide.merge(gt[["id","Human_label","Human_sarcasm","Human_ethics"]], on="id", how="left")
+    llm_labels = st.session_state.llm_labels
+    sig = _frame_digest([base, gt, *llm_labels.values()], *llm_labels.keys())
+    wide = _prep_eval(sig, base, llm_labels, gt)
 
     # Final table
     final_cols = ["id","text","platform","vader_label"]
@@ -2203,57 +2687,16 @@ def _render_benchmark_tab() -> None:
     model_tags = _safe_model_tags(wide)
     metrics_rows = []
     per_platform = {"youtube": [], "twitter": []}
-    conf_by_model = {}
+    counts_by_model: Dict[str, np.ndarray] = {}
 
     for tag in model_tags:
-        lab_col = "vader_label" if tag == "VADER" else f"{tag}_label"
-        sub = wide[["platform","Human_label", lab_col]].dropna(subset=[lab_col, "Human_label"]).copy()
-        sub[lab_col]       = _norm_label_series(sub[lab_col])
-        sub["Human_label"] = _norm_label_series(sub["Human_label"])
-        y_t = sub["Human_label"].tolist()
-        y_p = sub[lab_col].tolist()
-
-        acc   = _accuracy(y_t, y_p)
-        _, _, mf1 = _prf1(y_t, y_p)
-        wf1   = _weighted_f1(y_t, y_p)
-        kappa = _cohen_kappa(y_t, y_p)
-        mcc   = _mcc_multiclass(y_t, y_p)
-
-        if tag != "VADER" and f"{tag}_sarcasm" in wide.columns and "Human_sarcasm" in wide.columns:
-            ssub = wide[[f"{tag}_sarcasm", "Human_sarcasm"]].dropna()
-            import numpy as _np
-            sarcasm_acc = float(_np.mean(_np.array(_norm_bool_series(ssub[f"{tag}_sarcasm"])) == _np.array(_norm_bool_series(ssub["Human_sarcasm"])))) if len(ssub) else float("nan")
-        else:
-            sarcasm_acc = float("nan")
-        if tag != "VADER" and f"{tag}_ethics" in wide.columns and "Human_ethics" in wide.columns:
-            ej = [_jaccard_lists(_norm_ethics_cell(p), _norm_ethics_cell(h)) for p,h in zip(wide[f"{tag}_ethics"], wide["Human_ethics"])]
-            ethics_j = float(np.mean([x for x in ej if x is not None])) if len(ej) else float("nan")
-        else:
-            ethics_j = float("nan")
-
-        metrics_rows.append({
-            "model": tag, "n": len(sub),
-            "accuracy": round(acc,6),
-            "macro_f1": round(mf1,6),
-            "weighted_f1": round(wf1,6),
-            "kappa": round(kappa,6),
-            "mcc": round(mcc,6),
-            "sarcasm_acc": None if np.isnan(sarcasm_acc) else round(float(sarcasm_acc),6),
-            "ethics_jaccard": None if np.isnan(ethics_j) else round(float(ethics_j),6),
-        })
-
-        for plat, g in sub.groupby("platform", dropna=False):
-            ytp = g["Human_label"].tolist()
-            ypp = g[lab_col].tolist()
-            row = {"model": tag, "n": len(g),
-                   "neg": int(sum(1 for x in ypp if x == "negative")),
-                   "neu": int(sum(1 for x in ypp if x == "neutral")),
-                   "pos": int(sum(1 for x in ypp if x == "positive")),
-                   "acc": round(_accuracy(ytp, ypp), 6)}
-            key = str(plat).strip().lower()
-            if key in per_platform: per_platform[key].append(row)
+        metrics_row, cm = _eval_one(tag, wide)
+        metrics_rows.append(metrics_row)
+        counts_by_model[tag] = cm
 
-        conf_by_model[tag] = _confusion(y_t, y_p)
+    cube = _per_platform_cube(wide, model_tags)
+    for key in per_platform:
+        per_platform[key] = cube[cube["platform"] == key].drop(columns=["platform"]).to_dict("records")
 
     overall_df = pd.DataFrame(metrics_rows, columns=[
         "model","n","accuracy","macro_f1","weighted_f1","kappa","mcc","sarcasm_acc","ethics_jaccard"
@@ -2290,7 +2733,8 @@ def _render_benchmark_tab() -> None:
     try:
         best_tag = overall_df.sort_values(["macro_f1","accuracy"], ascending=False).iloc[0]["model"]
         st.subheader(f"Best model based on confusion matrix: {best_tag}")
-        cm = conf_by_model.get(best_tag, pd.DataFrame())
+        # only the best model's matrix is displayed/exported, so only it becomes a DataFrame
+        cm = _confusion_frame(counts_by_model[best_tag]) if best_tag in counts_by_model else pd.DataFrame()
         st.dataframe(cm, width='stretch', height=165)  # full 3 rows
         (outdir / f"Evaluation Tab - {best_tag} Confusion Matrix Table.csv").write_text(
             cm.to_csv(index=True), encoding="utf-8"
@@ -2334,7 +2778,7 @@ with tabs[0]:
             if not urls or not any(u.strip() for u in urls):
                 st.error("No URLs provided."); st.stop()
             df_yt = run_youtube(
-                [u.strip() for u in urls if u.strip()],
+                urls,
                 crx_path=Path(crx_path),
                 chrome_binary=chrome_bin,
                 chromedriver=chromedriver,
@@ -2380,7 +2824,7 @@ with tabs[1]:
                 st.warning("No tweets returned.")
             else:
                 (APP_OUTDIR / "twitter.csv").write_text(df_tw.to_csv(index=False), encoding="utf-8")
-                st.dataframe(_strip_pii(df_tw).head(50))
+                st.dataframe(_strip_pii(df_tw.head(50)))
                 st.success(f"Twitter rows: {len(df_tw)}")
         except Exception as e:
             st.exception(e)
@@ -2410,7 +2854,7 @@ with tabs[2]:
         with chart_1:
             st.metric("Rows", len(dfv))
         with chart_2:
-            counts = dfv["vader_label"].value_counts(dropna=False).to_dict()
+            counts = dfv["vader_label"].astype(object).value_counts(dropna=False).to_dict()
             st.json(counts)
         with chart_3:
             mean_vader = float(dfv["vader"].mean())
@@ -2461,16 +2905,43 @@ with tabs[3]:
             scored_cols = ["id","platform","video","text","likes","posted","is_reply"]
             base_df = st.session_state.df_scored[scored_cols].copy()
 
-            # run all models at once
+            # run all models at once: each model labels on its own worker thread (sharing the rpm limiter),
+            # while this thread keeps the telemetry boxes updated from the latest per-model progress
             all_outputs = {}
-            for m in models:
-                out = run_llm_batch(
-                    base_df,
-                    model=m, api_key=api_key, rpm=int(rpm),
-                    max_prompt_chars=int(prompt_chars), toks_per_row=int(toks_per_row),
-                    outdir=APP_OUTDIR,
-                    progress_cb=_progress,
-                )
+            model_state: Dict[str, Dict[str, Any]] = {}
+            def _merged_progress():
+                snap = list(model_state.values())
+                if not snap: return
+                _progress({
+                    "planned": sum(x.get("planned", 0) for x in snap),
+                    "made": _API_CALLS_MADE, "cache": _API_CACHE_HITS,
+                    "chunk": (sum(x.get("chunk", (0,0))[0] for x in snap), sum(x.get("chunk", (0,0))[1] for x in snap)),
+                    "debug": snap[-1].get("debug", []),
+                })
+            cancel = threading.Event()
+            futs = {}
+            with ThreadPoolExecutor(max_workers=max(1, len(models))) as pool:
+                try:
+                    futs = {m: pool.submit(
+                        run_llm_batch, base_df,
+                        model=m, api_key=api_key, rpm=int(rpm),
+                        max_prompt_chars=int(prompt_chars), toks_per_row=int(toks_per_row),
+                        outdir=APP_OUTDIR,
+                        progress_cb=lambda state, m=m: model_state.__setitem__(m, state),
+                        cancel=cancel,
+                    ) for m in models}
+                    pending = set(futs.values())
+                    while pending:
+                        _, pending = wait(pending, timeout=0.5)
+                        _merged_progress()
+                finally:
+                    # a Stop/Rerun raised here must not wait for every model to finish every chunk:
+                    # workers stop at their next chunk, and runs that have not started are dropped
+                    cancel.set()
+                    for fut in futs.values():
+                        fut.cancel()
+            for m, fut in futs.items():
+                out = fut.result()
                 st.session_state.llm_labels[_file_token_from_model(m)] = out
                 all_outputs[m] = out
 